@@ -0,0 +1,32 @@
+"""
+Helpers shared by the Proxmox resource providers.
+"""
+
+from typing import Any, Dict
+
+
+def _parse_vm_id(value: str) -> int:
+    """Parse a resource ID to a guest ID, accepting float-formatted IDs such as "215.0"."""
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _canon(value: Any) -> Any:
+    """
+    Normalize a property value for change detection.
+
+    Empty dicts and lists count as unset, so {} vs a missing property is not
+    reported as a change. Other values compare with plain ==, which is already
+    order-insensitive for dicts.
+    """
+    if isinstance(value, (dict, list)) and not value:
+        return None
+    return value
+
+
+def _put(props: Dict[str, Any], key: str, value: Any) -> None:
+    """Set props[key] unless value is None."""
+    if value is not None:
+        props[key] = value
@@ -2,11 +2,232 @@
 Proxmox API client for communicating with Proxmox VE.
 """
 
+import functools
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import requests
 import urllib3
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from typing import Callable, Dict, Any, Iterable, Optional, Tuple, Type
 import pulumi
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from curl_cffi import requests as curl_requests
+except ImportError:  # pragma: no cover - optional dependency
+    curl_requests = None  # type: ignore[assignment]
+
+# Errors raised by the available HTTP backends and response decoders
+_REQUEST_ERRORS: Tuple[Type[BaseException], ...] = (requests.exceptions.RequestException,)
+if curl_requests is not None:
+    _REQUEST_ERRORS += (curl_requests.exceptions.RequestException,)
+if orjson is not None:
+    _REQUEST_ERRORS += (orjson.JSONDecodeError,)
+
+# Transport-level retries for transient gateway errors and dropped connections,
+# used by both HTTP backends
+_RETRY_TOTAL = 5
+_RETRY_BACKOFF = 0.3
+_RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Set once InsecureRequestWarning has been silenced for the process
+_WARNINGS_DISABLED = False
+
+# Sessions shared between ProxmoxAPI instances, keyed by (endpoint, insecure)
+_SESSIONS: Dict[Tuple[str, bool], Any] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+# Auth tickets shared between ProxmoxAPI instances, keyed by (endpoint, username).
+# Proxmox tickets live for 2 hours, reuse them for slightly less than that.
+_TICKET_CACHE: Dict[Tuple[str, str], Tuple[str, str, float]] = {}
+_TICKET_TTL = 7000
+
+# Limit on concurrent batch operations per Proxmox node, keyed by (endpoint, node)
+_NODE_CONCURRENCY = 8
+_NODE_SEMAPHORES: Dict[Tuple[str, str], threading.BoundedSemaphore] = {}
+_NODE_SEMAPHORES_LOCK = threading.Lock()
+
+# LXC config fields that Proxmox reports in the same form they are sent, so they
+# can be compared with the current config to skip unchanged values
+_LXC_SCALAR_FIELDS = frozenset({"cores", "memory", "swap", "hostname", "onboot"})
+
+# Disk config as passed by users ("local-lvm:10") and size as reported by Proxmox ("size=10G")
+_DISK_RE = re.compile(r"^([^:]+):(\d+)$")
+_DISK_SIZE_RE = re.compile(r"size=(\d+)G")
+
+
+def _disable_insecure_warnings() -> None:
+    """Silence urllib3's InsecureRequestWarning, once per process."""
+    global _WARNINGS_DISABLED
+    if not _WARNINGS_DISABLED:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        _WARNINGS_DISABLED = True
+
+
+def _use_curl() -> bool:
+    """Check whether the libcurl backend is selected with PROXMOX_HTTP_BACKEND=curl."""
+    if os.environ.get("PROXMOX_HTTP_BACKEND", "").lower() != "curl":
+        return False
+    if curl_requests is None:
+        pulumi.log.warn("PROXMOX_HTTP_BACKEND=curl but curl_cffi is not installed, using requests")
+        return False
+    return True
+
+
+class _CurlRetrySession:
+    """
+    curl_cffi session with the same retries as the requests HTTPAdapter.
+
+    Gateway errors and connection failures are retried up to _RETRY_TOTAL
+    times with exponential backoff. Everything else is delegated to the
+    wrapped session.
+    """
+
+    def __init__(self, session: Any) -> None:
+        self._session = session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Send a request, retrying transient failures."""
+        for attempt in range(_RETRY_TOTAL + 1):
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (curl_requests.exceptions.ConnectionError, curl_requests.exceptions.Timeout):
+                if attempt == _RETRY_TOTAL:
+                    raise
+            else:
+                if response.status_code not in _RETRY_STATUSES or attempt == _RETRY_TOTAL:
+                    return response
+            time.sleep(_RETRY_BACKOFF * 2**attempt)
+        raise AssertionError("unreachable")
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        """Send a POST request, retrying transient failures."""
+        return self.request("POST", url, **kwargs)
+
+
+def _get_shared_session(endpoint: str, insecure: bool) -> Any:
+    """
+    Return a pooled session for the given endpoint.
+
+    Sessions carry no authentication state, so resources talking to the same
+    Proxmox endpoint can reuse the same keep-alive connections. The session is
+    a requests.Session, or a curl_cffi Session when PROXMOX_HTTP_BACKEND=curl.
+    """
+    key = (endpoint, insecure)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None and _use_curl():
+            session = _CurlRetrySession(curl_requests.Session(verify=not insecure))
+            _SESSIONS[key] = session
+        elif session is None:
+            session = requests.Session()
+            session.verify = not insecure
+
+            # Retry transient gateway errors at the transport level
+            retry = Retry(
+                total=_RETRY_TOTAL,
+                backoff_factor=_RETRY_BACKOFF,
+                status_forcelist=sorted(_RETRY_STATUSES),
+                allowed_methods=frozenset(["GET", "PUT", "POST", "DELETE"]),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSIONS[key] = session
+        return session
+
+
+def _get_node_semaphore(endpoint: str, node: str) -> threading.BoundedSemaphore:
+    """Return the semaphore limiting concurrent batch operations on a node."""
+    key = (endpoint, node)
+    with _NODE_SEMAPHORES_LOCK:
+        semaphore = _NODE_SEMAPHORES.get(key)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(_NODE_CONCURRENCY)
+            _NODE_SEMAPHORES[key] = semaphore
+        return semaphore
+
+
+# Create payload fields: (param name, Proxmox key, type, default)
+_VM_CREATE_FIELDS: Tuple[Tuple[str, str, Callable[[Any], Any], Any], ...] = (
+    ("cores", "cores", int, 1),
+    ("memory", "memory", int, 512),
+)
+_LXC_CREATE_FIELDS: Tuple[Tuple[str, str, Callable[[Any], Any], Any], ...] = (
+    ("cores", "cores", int, 1),
+    ("memory", "memory", int, 512),
+    ("swap", "swap", int, 512),
+    ("unprivileged", "unprivileged", int, True),
+)
+# Optional create payload fields, sent only when set: (param name, Proxmox key)
+_LXC_CREATE_OPTIONAL_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("ostemplate", "ostemplate"),
+    ("password", "password"),
+    ("ssh_public_keys", "ssh-public-keys"),
+    ("startup", "startup"),
+)
+
+
+def _build_params(
+    params: Dict[str, Any],
+    fields: Tuple[Tuple[str, str, Callable[[Any], Any], Any], ...],
+    optional_fields: Tuple[Tuple[str, str], ...] = (),
+) -> Dict[str, Any]:
+    """Build a Proxmox payload from resource params using a field table."""
+    payload = {key: cast(params.get(name, default)) for name, key, cast, default in fields}
+    for name, key in optional_fields:
+        value = params.get(name)
+        if value:
+            payload[key] = value
+    return payload
+
+
+@dataclass(frozen=True, slots=True)
+class _LxcPaths:
+    """API paths for a single LXC container."""
+
+    base: str
+    status: str
+    config: str
+    resize: str
+    start: str
+    stop: str
+    shutdown: str
+
+
+@functools.lru_cache(maxsize=512)
+def _lxc_paths(node: str, vm_id: int) -> _LxcPaths:
+    """Build (and cache) the API paths for an LXC container."""
+    base = f"nodes/{node}/lxc/{vm_id}"
+    return _LxcPaths(
+        base=base,
+        status=f"{base}/status/current",
+        config=f"{base}/config",
+        resize=f"{base}/resize",
+        start=f"{base}/status/start",
+        stop=f"{base}/status/stop",
+        shutdown=f"{base}/status/shutdown",
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_features(items: Tuple[Tuple[str, Any], ...]) -> str:
+    """Encode feature items to the Proxmox "key1=value1,key2=value2" format."""
+    return ",".join([f"{k}={v}" for k, v in items])
+
 
 class ProxmoxAPI:
     """Client for Proxmox VE API."""
@@ -18,33 +239,73 @@ class ProxmoxAPI:
         password: Optional[str] = None,
         node: Optional[str] = None,
         insecure: bool = False,
+        debug: Optional[bool] = None,
     ):
         """Initialize Proxmox API client with configuration."""
         if endpoint is None:
             # Fallback to config if not provided directly
             config = pulumi.Config("proxmox")
-            self.endpoint = config.require("endpoint")
+            self.endpoint = config.require("endpoint").rstrip("/")
             self.username = config.require("username")
             self.password = config.require_secret("password")
             self.node = config.get("node", "pve")
             self.insecure = config.get_bool("insecure", False)
         else:
-            self.endpoint = endpoint
+            self.endpoint = endpoint.rstrip("/")
             self.username = username
             self.password = password
             self.node = node or "pve"
             self.insecure = insecure
 
+        if debug is None:
+            debug = pulumi.Config("proxmox").get_bool("debug", False)
+        self.debug = bool(debug)
+
         # Disable SSL warnings if insecure mode
         if self.insecure:
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-        self.session = requests.Session()
+            _disable_insecure_warnings()
+
+        self.timeout = 30
+        self.session = _get_shared_session(self.endpoint, self.insecure)
+        self.ticket: Optional[str] = None
+        self.csrf_token: Optional[str] = None
+        self._auth_headers: Dict[str, str] = {}
+        self._auth_cookies: Dict[str, str] = {}
+        # Serializes logins when several threads share this client (delete_lxc_batch)
+        self._auth_lock = threading.Lock()
+
+    def _dbg(self, msg_fn: Callable[[], str]) -> None:
+        """Log a debug message, building it only when debug logging is enabled."""
+        if self.debug:
+            pulumi.log.info(msg_fn())
+
+    def _set_ticket(self, ticket: str, csrf_token: str) -> None:
+        """Store the ticket and the headers/cookies sent with each request."""
+        self.ticket = ticket
+        self.csrf_token = csrf_token
+
+        # Authentication is sent per request, the session is shared
+        self._auth_headers = {"CSRFPreventionToken": csrf_token}
+        self._auth_cookies = {"PVEAuthCookie": ticket}
+
+    def _invalidate_ticket(self) -> None:
+        """Forget the current ticket, both locally and in the shared cache."""
+        _TICKET_CACHE.pop((self.endpoint, str(self.username)), None)
         self.ticket = None
         self.csrf_token = None
+        self._auth_headers = {}
+        self._auth_cookies = {}
 
     def _authenticate(self) -> bool:
         """Authenticate with Proxmox and get ticket."""
+        cache_key = (self.endpoint, str(self.username))
+        cached = _TICKET_CACHE.get(cache_key)
+        if cached is not None:
+            ticket, csrf_token, issued_at = cached
+            if time.time() - issued_at < _TICKET_TTL:
+                self._set_ticket(ticket, csrf_token)
+                return True
+
         auth_url = f"{self.endpoint}/access/ticket"
 
         # Get the actual password value
@@ -53,17 +314,15 @@ class ProxmoxAPI:
         auth_data = {"username": self.username, "password": password_value}
 
         try:
-            response = self.session.post(auth_url, data=auth_data, verify=not self.insecure, timeout=30)
+            response = self.session.post(auth_url, data=auth_data, timeout=self.timeout)
             response.raise_for_status()
 
             result = response.json()
             if result.get("data"):
-                self.ticket = result["data"]["ticket"]
-                self.csrf_token = result["data"]["CSRFPreventionToken"]
-
-                # Set authentication headers
-                self.session.headers.update({"CSRFPreventionToken": self.csrf_token})
-                self.session.cookies.set("PVEAuthCookie", self.ticket)
+                ticket = result["data"]["ticket"]
+                csrf_token = result["data"]["CSRFPreventionToken"]
+                _TICKET_CACHE[cache_key] = (ticket, csrf_token, time.time())
+                self._set_ticket(ticket, csrf_token)
                 return True
 
         except Exception as e:
@@ -72,30 +331,67 @@ class ProxmoxAPI:
 
         return False
 
-    def _make_request(self, method: str, path: str, data: Optional[Dict] = None) -> Dict[str, Any]:
-        """Make authenticated request to Proxmox API."""
-        if not self.ticket:
+    def _ensure_ticket(self) -> None:
+        """Log in unless a ticket is already held."""
+        if self.ticket:
+            return
+        with self._auth_lock:
+            if not self.ticket and not self._authenticate():
+                raise Exception("Failed to authenticate with Proxmox")
+
+    def _refresh_ticket(self, rejected: Optional[str]) -> None:
+        """Replace a ticket rejected by Proxmox, unless another thread already did."""
+        with self._auth_lock:
+            if self.ticket and self.ticket != rejected:
+                return
+            self._invalidate_ticket()
             if not self._authenticate():
                 raise Exception("Failed to authenticate with Proxmox")
 
-        url = f"{self.endpoint}/{path.lstrip('/')}"
+    def _send(self, method: str, url: str, data: Optional[Dict] = None) -> Any:
+        """Send a single request with the current authentication."""
+        # GET payloads are query parameters, everything else is a form body
+        is_get = method == "GET"
+        return self.session.request(
+            method,
+            url,
+            params=data if is_get else None,
+            data=None if is_get else data,
+            headers=self._auth_headers,
+            cookies=self._auth_cookies,
+            timeout=self.timeout,
+        )
+
+    def _make_request(self, method: str, path: str, data: Optional[Dict] = None, quiet: bool = False) -> Dict[str, Any]:
+        """
+        Make authenticated request to Proxmox API.
+
+        With quiet=True a failed request is raised without logging, for callers
+        that expect the failure and handle it themselves.
+        """
+        self._ensure_ticket()
+
+        # Paths are relative to the API root and never start with "/"
+        url = f"{self.endpoint}/{path}"
 
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url, verify=not self.insecure, timeout=30)
-            elif method.upper() == "POST":
-                response = self.session.post(url, data=data, verify=not self.insecure, timeout=30)
-            elif method.upper() == "PUT":
-                response = self.session.put(url, data=data, verify=not self.insecure, timeout=30)
-            elif method.upper() == "DELETE":
-                response = self.session.delete(url, verify=not self.insecure, timeout=30)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            ticket = self.ticket
+            response = self._send(method, url, data)
+            if response.status_code == 401:
+                # The cached ticket expired or was revoked, log in again once
+                pulumi.log.info("Proxmox ticket rejected, re-authenticating")
+                self._refresh_ticket(ticket)
+                response = self._send(method, url, data)
 
             response.raise_for_status()
+            if orjson is not None:
+                result: Dict[str, Any] = orjson.loads(response.content)
+                return result
             return response.json()
 
-        except requests.exceptions.RequestException as e:
+        except _REQUEST_ERRORS as e:
+            if quiet:
+                raise
             pulumi.log.error(f"API request failed: {str(e)}")
             if hasattr(e, "response") and e.response is not None:
                 try:
@@ -109,24 +405,16 @@ class ProxmoxAPI:
         """Create a new virtual machine."""
         pulumi.log.info(f"Creating VM {vm_id} on node {self.node}")
 
-        vm_params = {
-            "vmid": int(vm_id),
-            "cores": int(params.get("cores", 1)),
-            "memory": int(params.get("memory", 512)),
-            "name": params.get("name", f"vm-{vm_id}"),
-        }
-
-        disks = params.get("disks", {})
-        for disk_name, disk_config in disks.items():
-            vm_params[disk_name] = disk_config
+        vm_params = _build_params(params, _VM_CREATE_FIELDS)
+        vm_params["vmid"] = int(vm_id)
+        vm_params["name"] = params.get("name", f"vm-{vm_id}")
 
-        networks = params.get("networks", {})
-        for net_name, net_config in networks.items():
-            vm_params[net_name] = net_config
+        vm_params.update(params.get("disks", {}))
+        vm_params.update(params.get("networks", {}))
 
-        pulumi.log.info(f"VM params: {vm_params}")
+        self._dbg(lambda: f"VM params: {vm_params}")
         result = self._make_request("POST", f"nodes/{self.node}/qemu", vm_params)
-        pulumi.log.info(f"VM creation initiated: {result}")
+        self._dbg(lambda: f"VM creation initiated: {result}")
         return result
 
     def get_vm(self, vm_id: int) -> Dict[str, Any]:
@@ -152,18 +440,14 @@ class ProxmoxAPI:
             vm_params["name"] = params["name"]
 
         if "disks" in params:
-            disks = params["disks"]
-            for disk_name, disk_config in disks.items():
-                vm_params[disk_name] = disk_config
+            vm_params.update(params["disks"])
 
         if "networks" in params:
-            networks = params["networks"]
-            for net_name, net_config in networks.items():
-                vm_params[net_name] = net_config
+            vm_params.update(params["networks"])
 
-        pulumi.log.info(f"VM update params: {vm_params}")
+        self._dbg(lambda: f"VM update params: {vm_params}")
         result = self._make_request("PUT", f"nodes/{self.node}/qemu/{vm_id}/config", vm_params)
-        pulumi.log.info(f"VM update completed: {result}")
+        self._dbg(lambda: f"VM update completed: {result}")
         return result
 
     def delete_vm(self, vm_id: int) -> Dict[str, Any]:
@@ -177,7 +461,7 @@ class ProxmoxAPI:
             pulumi.log.warn(f"Failed to stop VM {vm_id}: {str(e)}")
 
         result = self._make_request("DELETE", f"nodes/{self.node}/qemu/{vm_id}")
-        pulumi.log.info(f"VM deletion completed: {result}")
+        self._dbg(lambda: f"VM deletion completed: {result}")
         return result
 
     def start_vm(self, vm_id: int) -> Dict[str, Any]:
@@ -191,93 +475,95 @@ class ProxmoxAPI:
         pulumi.log.info(f"Creating LXC {vm_id} on node {self.node}")
 
         # Base parameters for LXC creation
-        lxc_params = {
-            "vmid": int(vm_id),
-            "cores": int(params.get("cores", 1)),
-            "memory": int(params.get("memory", 512)),
-            "swap": int(params.get("swap", 512)),
-            "hostname": params.get("hostname", f"lxc-{vm_id}"),
-            "unprivileged": int(params.get("unprivileged", True)),
-        }
-
-        if params.get("ostemplate"):
-            lxc_params["ostemplate"] = params["ostemplate"]
+        lxc_params = _build_params(params, _LXC_CREATE_FIELDS, _LXC_CREATE_OPTIONAL_FIELDS)
+        lxc_params["vmid"] = int(vm_id)
+        lxc_params["hostname"] = params.get("hostname", f"lxc-{vm_id}")
 
-        if params.get("password"):
-            lxc_params["password"] = params["password"]
-
-        if params.get("ssh_public_keys"):
-            lxc_params["ssh-public-keys"] = params["ssh_public_keys"]
-
-        disks = params.get("disks", {})
-        for disk_name, disk_config in disks.items():
-            lxc_params[disk_name] = disk_config
-
-        networks = params.get("networks", {})
-        for net_name, net_config in networks.items():
-            lxc_params[net_name] = net_config
+        lxc_params.update(params.get("disks", {}))
+        lxc_params.update(params.get("networks", {}))
 
         features = params.get("features", {})
         if features:
             # Convert features dictionary to string format "key1=value1,key2=value2"
-            features_str = ",".join([f"{k}={v}" for k, v in features.items()])
-            lxc_params["features"] = features_str
-
-        if params.get("startup"):
-            lxc_params["startup"] = params["startup"]
+            lxc_params["features"] = _encode_features(tuple(sorted(features.items())))
 
         if params.get("onboot") is not None:
             lxc_params["onboot"] = 1 if params["onboot"] else 0
-            pulumi.log.info(f"Added onboot: {params['onboot']} -> {lxc_params['onboot']}")
+            self._dbg(lambda: f"Added onboot: {params['onboot']} -> {lxc_params['onboot']}")
         else:
-            pulumi.log.info(f"onboot not found in params: {list(params.keys())}")
+            self._dbg(lambda: f"onboot not found in params: {list(params.keys())}")
 
-        pulumi.log.info(f"LXC params: {lxc_params}")
+        self._dbg(lambda: f"LXC params: {lxc_params}")
         result = self._make_request("POST", f"nodes/{self.node}/lxc", lxc_params)
-        pulumi.log.info(f"LXC creation initiated: {result}")
+        self._dbg(lambda: f"LXC creation initiated: {result}")
         return result
 
     def get_lxc(self, vm_id: int) -> Dict[str, Any]:
         """Get LXC container information."""
         try:
             vm_id = int(vm_id)  # Ensure this is an integer
-            result = self._make_request("GET", f"nodes/{self.node}/lxc/{vm_id}/status/current")
+            result = self._make_request("GET", _lxc_paths(self.node, vm_id).status)
             return result.get("data", {})
         except Exception as e:
             pulumi.log.warn(f"Failed to get LXC {vm_id}: {str(e)}")
             return {}
 
-    def _resize_lxc_disk(self, vm_id: int, disk_name: str, disk_config: str) -> Dict[str, Any]:
+    def _get_lxc_config(self, vm_id: int) -> Dict[str, Any]:
+        """Get the current LXC container configuration, or {} if unavailable."""
+        try:
+            result = self._make_request("GET", _lxc_paths(self.node, int(vm_id)).config)
+            return result.get("data") or {}
+        except Exception as e:
+            pulumi.log.warn(f"Failed to get LXC {vm_id} config: {e}")
+            return {}
+
+    @staticmethod
+    def _lxc_disk_sizes(config: Dict[str, Any]) -> Dict[str, int]:
+        """Get the size in GB of each disk in an LXC config, keyed by disk name."""
+        sizes = {}
+        for key, value in config.items():
+            if isinstance(value, str):
+                match = _DISK_SIZE_RE.search(value)
+                if match:
+                    sizes[key] = int(match.group(1))
+        return sizes
+
+    def _resize_lxc_disk(
+        self,
+        vm_id: int,
+        disk_name: str,
+        disk_config: str,
+        current_sizes: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Any]:
         """
         Resize LXC container disk.
 
         For LXC usage API: PUT /nodes/{node}/lxc/{vmid}/resize
+        Skipped when current_sizes shows the disk already has the requested size.
         """
         if not disk_config or not isinstance(disk_config, str):
             return {}
 
         # Parsing disk_config like "local-lvm:10"
-        if ":" not in disk_config:
+        match = _DISK_RE.match(disk_config)
+        if not match:
             pulumi.log.warn(f"Invalid disk config format: {disk_config}")
             return {}
 
-        storage, size_part = disk_config.split(":", 1)
+        new_size_gb = int(match.group(2))
 
-        # Extract size (must be a number)
-        if not size_part.isdigit():
-            pulumi.log.warn(f"Invalid disk size format: {size_part}")
+        if current_sizes is not None and current_sizes.get(disk_name) == new_size_gb:
+            pulumi.log.info(f"LXC {vm_id} disk {disk_name} is already {new_size_gb}G")
             return {}
 
-        new_size_gb = int(size_part)
-
         pulumi.log.info(f"Resizing LXC {vm_id} disk {disk_name} to {new_size_gb}G")
 
         # Use API to resize disk
         resize_params = {"disk": disk_name, "size": f"{new_size_gb}G"}
 
         try:
-            result = self._make_request("PUT", f"nodes/{self.node}/lxc/{vm_id}/resize", resize_params)
-            pulumi.log.info(f"Disk resize completed: {result}")
+            result = self._make_request("PUT", _lxc_paths(self.node, int(vm_id)).resize, resize_params)
+            self._dbg(lambda: f"Disk resize completed: {result}")
             return result
         except Exception as e:
             pulumi.log.error(f"Failed to resize disk: {e}")
@@ -287,6 +573,10 @@ class ProxmoxAPI:
         """Update LXC container configuration."""
         pulumi.log.info(f"Updating LXC {vm_id}")
 
+        # Current config is used to skip no-op resizes and unchanged scalar fields
+        needs_config = "disks" in params or not _LXC_SCALAR_FIELDS.isdisjoint(params)
+        current = self._get_lxc_config(vm_id) if needs_config else {}
+
         lxc_params: Dict[str, Any] = {}
         if "cores" in params:
             lxc_params["cores"] = int(params["cores"])
@@ -300,26 +590,24 @@ class ProxmoxAPI:
         # Update disks - use special API for resizing
         if "disks" in params:
             disks = params["disks"]
+            current_sizes = self._lxc_disk_sizes(current)
             for disk_name, disk_config in disks.items():
                 try:
-                    self._resize_lxc_disk(vm_id, disk_name, disk_config)
+                    self._resize_lxc_disk(vm_id, disk_name, disk_config, current_sizes)
                 except Exception as e:
                     pulumi.log.warn(f"Failed to resize disk {disk_name}: {e}")
                     # Continue with other disks
 
         # Update network interfaces
         if "networks" in params:
-            networks = params["networks"]
-            for net_name, net_config in networks.items():
-                lxc_params[net_name] = net_config
+            lxc_params.update(params["networks"])
 
         # Update features
         if "features" in params:
             features = params["features"]
             if features:
                 # Convert features dictionary to string format "key1=value1,key2=value2"
-                features_str = ",".join([f"{k}={v}" for k, v in features.items()])
-                lxc_params["features"] = features_str
+                lxc_params["features"] = _encode_features(tuple(sorted(features.items())))
 
         # Update startup parameters
         if "startup" in params:
@@ -329,12 +617,18 @@ class ProxmoxAPI:
         if "onboot" in params:
             lxc_params["onboot"] = 1 if params["onboot"] else 0
 
-        pulumi.log.info(f"LXC update params: {lxc_params}")
+        # Only send scalar fields that differ from the current config. Proxmox reports
+        # features, startup and net* in its own format, those are always sent.
+        lxc_params = {
+            k: v for k, v in lxc_params.items() if k not in _LXC_SCALAR_FIELDS or str(current.get(k)) != str(v)
+        }
+
+        self._dbg(lambda: f"LXC update params: {lxc_params}")
 
         # If there are no parameters to update, skip the request
         if lxc_params:
-            result = self._make_request("PUT", f"nodes/{self.node}/lxc/{vm_id}/config", lxc_params)
-            pulumi.log.info(f"LXC update completed: {result}")
+            result = self._make_request("PUT", _lxc_paths(self.node, int(vm_id)).config, lxc_params)
+            self._dbg(lambda: f"LXC update completed: {result}")
             return result
         else:
             pulumi.log.info("No configuration parameters to update")
@@ -347,20 +641,19 @@ class ProxmoxAPI:
         Sometimes after resize operations, the container remains locked.
         Wait up to max_retries seconds.
         """
-        import time
-
+        paths = _lxc_paths(self.node, int(vm_id))
         for attempt in range(max_retries):
             try:
                 # Check the current status of the container
-                result = self._make_request("GET", f"nodes/{self.node}/lxc/{vm_id}/status/current")
+                self._make_request("GET", paths.status)
 
                 # If we can get the status without errors, the container is unlocked
-                pulumi.log.info(f"LXC {vm_id} is unlocked (attempt {attempt + 1})")
+                self._dbg(lambda: f"LXC {vm_id} is unlocked (attempt {attempt + 1})")
                 return True
 
             except Exception as e:
                 if "timeout" in str(e).lower() or "lock" in str(e).lower():
-                    pulumi.log.info(f"LXC {vm_id} still locked, waiting... (attempt {attempt + 1}/{max_retries})")
+                    self._dbg(lambda: f"LXC {vm_id} still locked, waiting... (attempt {attempt + 1}/{max_retries})")
                     time.sleep(1)
                     continue
                 else:
@@ -375,15 +668,14 @@ class ProxmoxAPI:
         """
         Ожидает полной остановки LXC контейнера.
         """
-        import time
-
+        paths = _lxc_paths(self.node, int(vm_id))
         for attempt in range(max_retries):
             try:
                 # Check the current status of the container
-                result = self._make_request("GET", f"nodes/{self.node}/lxc/{vm_id}/status/current")
+                result = self._make_request("GET", paths.status)
 
                 status = result.get("data", {}).get("status", "unknown")
-                pulumi.log.info(f"LXC {vm_id} status: {status} (attempt {attempt + 1})")
+                self._dbg(lambda: f"LXC {vm_id} status: {status} (attempt {attempt + 1})")
 
                 if status == "stopped":
                     pulumi.log.info(f"LXC {vm_id} successfully stopped")
@@ -399,9 +691,76 @@ class ProxmoxAPI:
         pulumi.log.warn(f"LXC {vm_id} did not stop after {max_retries} seconds")
         return False
 
+    def _task_exit_status(self, upid: str, timeout: int = 60) -> Optional[str]:
+        """
+        Wait for a Proxmox task to finish and return its exit status.
+
+        Polls GET /nodes/{node}/tasks/{upid}/status with exponential backoff
+        (0.25s, 0.5s, 1s, 2s, then every 4s) instead of a fixed 1s interval.
+        The task status endpoint has no server-side wait option, and Proxmox
+        rejects parameters that are not in its schema, so polling stays on
+        the client side.
+        Returns "OK" on success, the error for a failed task, or None if the
+        task did not finish within the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            try:
+                result = self._make_request("GET", f"nodes/{self.node}/tasks/{upid}/status")
+                task = result.get("data") or {}
+                if task.get("status") == "stopped":
+                    exitstatus = str(task.get("exitstatus") or "unknown")
+                    if exitstatus == "OK":
+                        pulumi.log.info(f"Task {upid} finished")
+                    else:
+                        pulumi.log.warn(f"Task {upid} finished with status: {exitstatus}")
+                    return exitstatus
+            except Exception as e:
+                pulumi.log.warn(f"Error checking task {upid} status: {e}")
+
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(min(4.0, 0.25 * 2**attempt))
+            attempt += 1
+
+        pulumi.log.warn(f"Task {upid} did not finish after {timeout} seconds")
+        return None
+
+    def _wait_for_task(self, upid: str, timeout: int = 60) -> bool:
+        """Wait for a Proxmox task to finish, returns True if it finished with exit status OK."""
+        return self._task_exit_status(upid, timeout) == "OK"
+
+    def _wait_for_lxc_stop_task(self, vm_id: int, result: Dict[str, Any], timeout: int) -> bool:
+        """
+        Wait for a stop/shutdown request to take effect.
+
+        Uses the task UPID returned by Proxmox when there is one, and falls back
+        to polling the container status otherwise.
+        """
+        upid = result.get("data")
+        if isinstance(upid, str) and upid:
+            return self._wait_for_task(upid, timeout)
+        return self._wait_for_lxc_stop(vm_id, timeout)
+
     def delete_lxc(self, vm_id: int) -> Dict[str, Any]:
         """Delete LXC container with improved stop and delete logic."""
         pulumi.log.info(f"Deleting LXC {vm_id}")
+        vm_id = int(vm_id)
+        paths = _lxc_paths(self.node, vm_id)
+
+        # Fast path: a stopped and unlocked container can be deleted right away.
+        # Running containers are the common case, so that failure is not logged.
+        try:
+            result = self._make_request("DELETE", paths.base, quiet=True)
+            self._dbg(lambda: f"LXC deletion completed: {result}")
+            return result
+        except Exception as e:
+            error_msg = str(e).lower()
+            if "is running" not in error_msg and "lock" not in error_msg:
+                pulumi.log.error(f"Failed to delete LXC {vm_id}: {e}")
+                raise
+            pulumi.log.info(f"LXC {vm_id} cannot be deleted yet ({e}), stopping it first")
 
         # First, wait for the container to be unlocked
         self._wait_for_lxc_unlock(vm_id)
@@ -410,24 +769,25 @@ class ProxmoxAPI:
         try:
             current_status = self.get_lxc(vm_id)
             status = current_status.get("status", "unknown")
-            pulumi.log.info(f"LXC {vm_id} current status: {status}")
+            self._dbg(lambda: f"LXC {vm_id} current status: {status}")
 
             if status == "running":
                 # Stop the container gracefully
                 pulumi.log.info(f"Stopping LXC {vm_id}")
+                stop_result: Dict[str, Any] = {}
                 try:
-                    self._make_request("POST", f"nodes/{self.node}/lxc/{vm_id}/status/stop")
+                    stop_result = self._make_request("POST", paths.stop)
                     pulumi.log.info(f"Stop command sent to LXC {vm_id}")
                 except Exception as e:
                     pulumi.log.error(f"Failed to send stop command to LXC {vm_id}: {str(e)}")
 
                 # Wait for the container to stop
-                if not self._wait_for_lxc_stop(vm_id, 60):  # Wait up to 60 seconds
+                if not self._wait_for_lxc_stop_task(vm_id, stop_result, 60):  # Wait up to 60 seconds
                     # If it didn't stop, try forcing the shutdown
                     pulumi.log.warn(f"LXC {vm_id} did not stop gracefully, forcing shutdown")
                     try:
-                        self._make_request("POST", f"nodes/{self.node}/lxc/{vm_id}/status/shutdown")
-                        self._wait_for_lxc_stop(vm_id, 30)  # Wait another 30 seconds
+                        shutdown_result = self._make_request("POST", paths.shutdown)
+                        self._wait_for_lxc_stop_task(vm_id, shutdown_result, 30)  # Wait another 30 seconds
                     except Exception as e:
                         pulumi.log.error(f"Failed to force shutdown LXC {vm_id}: {str(e)}")
 
@@ -437,20 +797,18 @@ class ProxmoxAPI:
         # Wait again for unlock before deletion
         self._wait_for_lxc_unlock(vm_id)
 
-        # Retry logic for deletion
+        # Retry logic for deletion. Gateway errors and dropped connections are
+        # already retried by the shared session (either backend), so only Proxmox-level conflicts
+        # (container still running or locked) are retried here.
         max_delete_retries = 10  # Count of retries for deletion
         for attempt in range(max_delete_retries):
             try:
-                result = self._make_request("DELETE", f"nodes/{self.node}/lxc/{vm_id}")
-                pulumi.log.info(f"LXC deletion completed: {result}")
+                result = self._make_request("DELETE", paths.base)
+                self._dbg(lambda: f"LXC deletion completed: {result}")
                 return result
             except Exception as e:
                 error_msg = str(e).lower()
-                if (
-                    "container is running" in error_msg or "timeout" in error_msg or "lock" in error_msg
-                ) and attempt < max_delete_retries - 1:
-                    import time
-
+                if ("is running" in error_msg or "lock" in error_msg) and attempt < max_delete_retries - 1:
                     wait_time = (attempt + 1) * 3  # Up to: 3, 6, 9, 12... seconds
                     pulumi.log.warn(
                         f"Delete failed ({str(e)}), retrying in {wait_time}s... (attempt {attempt + 1}/{max_delete_retries})"
@@ -460,13 +818,13 @@ class ProxmoxAPI:
                     try:
                         current_status = self.get_lxc(vm_id)
                         status = current_status.get("status", "unknown")
-                        pulumi.log.info(f"LXC {vm_id} status before retry: {status}")
+                        self._dbg(lambda: f"LXC {vm_id} status before retry: {status}")
 
                         if status == "running":
                             # Attempt to stop again
                             pulumi.log.warn(f"LXC {vm_id} still running, attempting to stop again")
-                            self._make_request("POST", f"nodes/{self.node}/lxc/{vm_id}/status/shutdown")
-                            self._wait_for_lxc_stop(vm_id, 15)
+                            shutdown_result = self._make_request("POST", paths.shutdown)
+                            self._wait_for_lxc_stop_task(vm_id, shutdown_result, 15)
                     except Exception:
                         pass
 
@@ -479,12 +837,87 @@ class ProxmoxAPI:
         # Fallback return (must not be executed
         return {"data": None}
 
+    def delete_lxc_batch(self, vm_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Delete several LXC containers concurrently.
+
+        Each container goes through delete_lxc in a worker thread, so the stop
+        waits and delete retries of different containers overlap. Workers share
+        this client's session and ticket, and at most 8 deletes run at once
+        per node.
+        """
+        ids = [int(vm_id) for vm_id in vm_ids]
+        if not ids:
+            return {}
+
+        # Log in once up front rather than from every worker
+        self._ensure_ticket()
+
+        semaphore = _get_node_semaphore(self.endpoint, self.node)
+
+        def _delete(vm_id: int) -> Dict[str, Any]:
+            with semaphore:
+                return self.delete_lxc(vm_id)
+
+        results: Dict[int, Dict[str, Any]] = {}
+        failed: Dict[int, Exception] = {}
+        with ThreadPoolExecutor(max_workers=min(_NODE_CONCURRENCY, len(ids))) as executor:
+            futures = {vm_id: executor.submit(_delete, vm_id) for vm_id in ids}
+            for vm_id, future in futures.items():
+                try:
+                    results[vm_id] = future.result()
+                except Exception as e:
+                    failed[vm_id] = e
+
+        if failed:
+            pulumi.log.error(f"Failed to delete LXC containers: {sorted(failed)}")
+            raise Exception(f"Failed to delete LXC containers {sorted(failed)}: {next(iter(failed.values()))}")
+
+        pulumi.log.info(f"Deleted {len(results)} LXC containers")
+        return results
+
     def start_lxc(self, vm_id: int) -> Dict[str, Any]:
         """Start LXC container."""
         pulumi.log.info(f"Starting LXC {vm_id}")
-        result = self._make_request("POST", f"nodes/{self.node}/lxc/{int(vm_id)}/status/start")
+        result = self._make_request("POST", _lxc_paths(self.node, int(vm_id)).start)
         return result
 
+    def _wait_for_lxc_status(self, vm_id: int, target: str = "running", timeout: float = 30.0) -> str:
+        """
+        Wait for the LXC container to reach the target status.
+
+        Polls with exponential backoff (50ms doubling up to 500ms) until the status
+        matches or the timeout expires. Returns the last observed status.
+        """
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            status = str(self.get_lxc(vm_id).get("status", "unknown"))
+            if status == target or time.monotonic() >= deadline:
+                return status
+            time.sleep(min(0.05 * 2**attempt, 0.5))
+            attempt += 1
+
+    def start_lxc_and_wait(self, vm_id: int, timeout: int = 30) -> str:
+        """
+        Start LXC container and wait until it is running.
+
+        Waits on the start task when Proxmox returns one, a task that finished OK
+        means the container is running without another status request, and a
+        failed task is not waited on any further. Polls the container status
+        only when there is no task or it did not finish in time. Returns the
+        resulting status.
+        """
+        upid = self.start_lxc(vm_id).get("data")
+        if isinstance(upid, str) and upid:
+            exitstatus = self._task_exit_status(upid, timeout)
+            if exitstatus == "OK":
+                return "running"
+            if exitstatus is not None:
+                # The start failed, the container will not come up by polling for it
+                return str(self.get_lxc(vm_id).get("status", "unknown"))
+        return self._wait_for_lxc_status(vm_id, "running", timeout)
+
     def list_lxc_templates(self, storage: str = "local") -> Dict[str, Any]:
         """List available LXC templates."""
         pulumi.log.info(f"Listing LXC templates on storage {storage}")
@@ -495,7 +928,7 @@ class ProxmoxAPI:
                 {"content": "vztmpl"},
             )
             templates = result.get("data", [])
-            pulumi.log.info(f"Available templates: {[t.get('volid') for t in templates]}")
+            self._dbg(lambda: f"Available templates: {[t.get('volid') for t in templates]}")
             return result
         except Exception as e:
             pulumi.log.error(f"Failed to list templates: {str(e)}")
@@ -0,0 +1,198 @@
+"""
+Asynchronous Proxmox API client for communicating with Proxmox VE.
+
+Requires the optional ``async`` extra (``httpx[http2]``).
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import pulumi
+
+from .proxmox_api import _TICKET_CACHE, _TICKET_TTL
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore[assignment]
+
+
+class AsyncProxmoxAPI:
+    """
+    Async read-only client for Proxmox VE API.
+
+    Keeps one persistent HTTP/2 connection pool per client, so status reads for
+    many guests can be overlapped with ``asyncio.gather``. Shares the auth ticket
+    cache with ProxmoxAPI. Call ``aclose()`` (or use the client as an async
+    context manager) when done.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        node: Optional[str] = None,
+        insecure: bool = False,
+    ):
+        """Initialize async Proxmox API client with configuration."""
+        if httpx is None:
+            raise ImportError("AsyncProxmoxAPI requires httpx: pip install 'pulumi-proxmox-provider[async]'")
+
+        if endpoint is None:
+            # Fallback to config if not provided directly
+            config = pulumi.Config("proxmox")
+            self.endpoint = config.require("endpoint").rstrip("/")
+            self.username: Optional[str] = config.require("username")
+            self.password: Any = config.require_secret("password")
+            self.node = config.get("node", "pve")
+            self.insecure = config.get_bool("insecure", False)
+        else:
+            self.endpoint = endpoint.rstrip("/")
+            self.username = username
+            self.password = password
+            self.node = node or "pve"
+            self.insecure = insecure
+
+        self.timeout = 30
+        self._client = httpx.AsyncClient(
+            base_url=self.endpoint,
+            http2=True,
+            verify=not self.insecure,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=self.timeout,
+        )
+        self.ticket: Optional[str] = None
+        self.csrf_token: Optional[str] = None
+        # Coroutines fanned out with asyncio.gather log in once, not once each
+        self._auth_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncProxmoxAPI":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    def _set_ticket(self, ticket: str, csrf_token: str) -> None:
+        """Store the ticket on the client, which belongs to this instance only."""
+        self.ticket = ticket
+        self.csrf_token = csrf_token
+        self._client.headers["CSRFPreventionToken"] = csrf_token
+        self._client.cookies.set("PVEAuthCookie", ticket)
+
+    async def _authenticate(self) -> bool:
+        """Authenticate with Proxmox and get ticket."""
+        cache_key = (self.endpoint, str(self.username))
+        cached = _TICKET_CACHE.get(cache_key)
+        if cached is not None:
+            ticket, csrf_token, issued_at = cached
+            if time.time() - issued_at < _TICKET_TTL:
+                self._set_ticket(ticket, csrf_token)
+                return True
+
+        auth_data = {"username": self.username, "password": self.password}
+
+        try:
+            response = await self._client.post("access/ticket", data=auth_data)
+            response.raise_for_status()
+
+            result = response.json()
+            if result.get("data"):
+                ticket = result["data"]["ticket"]
+                csrf_token = result["data"]["CSRFPreventionToken"]
+                _TICKET_CACHE[cache_key] = (ticket, csrf_token, time.time())
+                self._set_ticket(ticket, csrf_token)
+                return True
+
+        except Exception as e:
+            pulumi.log.error(f"Authentication failed: {str(e)}")
+            return False
+
+        return False
+
+    async def _ensure_ticket(self) -> None:
+        """Log in unless a ticket is already held."""
+        if self.ticket:
+            return
+        async with self._auth_lock:
+            if not self.ticket and not await self._authenticate():
+                raise Exception("Failed to authenticate with Proxmox")
+
+    async def _refresh_ticket(self, rejected: Optional[str]) -> None:
+        """Replace a ticket rejected by Proxmox, unless another coroutine already did."""
+        async with self._auth_lock:
+            if self.ticket and self.ticket != rejected:
+                return
+            _TICKET_CACHE.pop((self.endpoint, str(self.username)), None)
+            self.ticket = None
+            if not await self._authenticate():
+                raise Exception("Failed to authenticate with Proxmox")
+
+    async def _send(self, method: str, path: str, data: Optional[Dict] = None) -> "httpx.Response":
+        """Send a single request with the current authentication."""
+        # GET payloads are query parameters, everything else is a form body
+        if method == "GET":
+            return await self._client.request(method, path, params=data)
+        return await self._client.request(method, path, data=data)
+
+    async def _make_request(self, method: str, path: str, data: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make authenticated request to Proxmox API."""
+        await self._ensure_ticket()
+
+        try:
+            ticket = self.ticket
+            response = await self._send(method, path, data)
+            if response.status_code == 401:
+                # The cached ticket expired or was revoked, log in again once
+                pulumi.log.info("Proxmox ticket rejected, re-authenticating")
+                await self._refresh_ticket(ticket)
+                response = await self._send(method, path, data)
+
+            response.raise_for_status()
+            result: Dict[str, Any] = response.json()
+            return result
+
+        except httpx.HTTPError as e:
+            pulumi.log.error(f"API request failed: {str(e)}")
+            if isinstance(e, httpx.HTTPStatusError):
+                try:
+                    error_details = e.response.json()
+                    pulumi.log.error(f"Error details: {error_details}")
+                except Exception:
+                    pulumi.log.error(f"Response text: {e.response.text}")
+            raise
+
+    async def get_vm(self, vm_id: int) -> Dict[str, Any]:
+        """Get virtual machine information."""
+        try:
+            vm_id = int(vm_id)
+            result = await self._make_request("GET", f"nodes/{self.node}/qemu/{vm_id}/status/current")
+            data: Dict[str, Any] = result.get("data", {})
+            return data
+        except Exception as e:
+            pulumi.log.warn(f"Failed to get VM {vm_id}: {str(e)}")
+            return {}
+
+    async def get_lxc(self, vm_id: int) -> Dict[str, Any]:
+        """Get LXC container information."""
+        try:
+            vm_id = int(vm_id)
+            result = await self._make_request("GET", f"nodes/{self.node}/lxc/{vm_id}/status/current")
+            data: Dict[str, Any] = result.get("data", {})
+            return data
+        except Exception as e:
+            pulumi.log.warn(f"Failed to get LXC {vm_id}: {str(e)}")
+            return {}
+
+    async def get_lxc_many(self, vm_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Get information for several LXC containers concurrently."""
+        return list(await asyncio.gather(*(self.get_lxc(vm_id) for vm_id in vm_ids)))
+
+    async def get_vm_many(self, vm_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Get information for several virtual machines concurrently."""
+        return list(await asyncio.gather(*(self.get_vm(vm_id) for vm_id in vm_ids)))
@@ -2,89 +2,127 @@
 LXC Container resource for Proxmox.
 """
 
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import InitVar, dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 import pulumi
 import pulumi.dynamic as dynamic
+from ._util import _canon, _parse_vm_id, _put
 from .proxmox_api import ProxmoxAPI
 
+# Properties that can be changed on an existing container
+_LXC_UPDATABLE = frozenset(
+    {"cores", "memory", "swap", "hostname", "disks", "networks", "features", "startup", "onboot"}
+)
 
+# Read-only defaults shared by all args instances
+_LXC_DEFAULT_DISKS: Mapping[str, str] = MappingProxyType({"rootfs": "local-lvm:8"})
+_LXC_DEFAULT_NETWORKS: Mapping[str, str] = MappingProxyType({"net0": "name=eth0,bridge=vmbr0,ip=dhcp"})
+
+# Reads the run status while update() applies a config change. Shared by all
+# updates so no thread pool is started per call.
+_STATUS_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="proxmox-lxc-status")
+
+
+# Proxmox connection settings without the password: (endpoint, username, node, insecure)
+_ProxmoxConfig = Tuple[str, str, str, bool]
+
+
+def _get_lxc_status(proxmox_cfg: _ProxmoxConfig, password: str, vm_id_str: str) -> str:
+    """Get the status of an LXC container, or "unknown" if it cannot be read."""
+    try:
+        endpoint, username, node, insecure = proxmox_cfg
+        api = ProxmoxAPI(endpoint=endpoint, username=username, password=password, node=node, insecure=insecure)
+
+        # Get LXC status
+        vm_id = int(vm_id_str)
+        lxc_info = api.get_lxc(vm_id)
+        status = lxc_info.get("status")
+        return status if status is not None else "unknown"
+    except Exception as e:
+        pulumi.log.warn(f"Failed to get LXC status: {e}")
+        return "unknown"
+
+
+@dataclass(slots=True)
 class LXCContainerArgs:
     """Arguments for creating an LXC Container."""
 
-    def __init__(
-        self,
-        node: str,
-        vm_id: Optional[int] = None,
-        hostname: Optional[str] = None,
-        template: Optional[str] = None,
-        cores: Optional[int] = None,
-        memory: Optional[int] = None,
-        swap: Optional[int] = None,
-        # Disk configuration
-        disks: Optional[Dict[str, str]] = None,
-        # Network configuration
-        networks: Optional[Dict[str, str]] = None,
-        # Legacy parameters for compatibility
-        disk_size: Optional[str] = None,
-        network: Optional[str] = None,
-        # LXC specific parameters
-        ostemplate: Optional[str] = None,
-        password: Optional[str] = None,
-        ssh_public_keys: Optional[str] = None,
-        unprivileged: Optional[bool] = None,
-        features: Optional[Dict[str, str]] = None,
-        startup: Optional[str] = None,
-        onboot: Optional[bool] = None,
-        start_on_create: Optional[bool] = None,
-    ):
-        self.node = node
-        self.vm_id = vm_id
-        self.hostname = hostname
-        self.template = template
-        self.cores = cores or 1
-        self.memory = memory or 512
-        self.swap = swap or 512
+    node: str
+    vm_id: Optional[int] = None
+    hostname: Optional[str] = None
+    template: Optional[str] = None
+    cores: Optional[int] = None
+    memory: Optional[int] = None
+    swap: Optional[int] = None
+    # Disk configuration
+    disks: Optional[Mapping[str, str]] = None
+    # Network configuration
+    networks: Optional[Mapping[str, str]] = None
+    # Legacy parameters for compatibility
+    disk_size: InitVar[Optional[str]] = None
+    network: InitVar[Optional[str]] = None
+    # LXC specific parameters
+    ostemplate: Optional[str] = None
+    password: Optional[str] = field(default=None, repr=False)
+    ssh_public_keys: Optional[str] = None
+    unprivileged: Optional[bool] = None
+    features: Optional[Dict[str, str]] = None
+    startup: Optional[str] = None
+    onboot: Optional[bool] = None
+    start_on_create: Optional[bool] = None
+
+    def __post_init__(self, disk_size: Optional[str], network: Optional[str]) -> None:
+        self.cores = self.cores or 1
+        self.memory = self.memory or 512
+        self.swap = self.swap or 512
 
         # Disk configuration
-        if disks is not None:
-            self.disks = disks
-        elif disk_size is not None:
-            # Legacy support: create rootfs by default
-            # Remove "G" from size if present, keep only the number
-            size = disk_size.replace("G", "").replace("g", "")
-            self.disks = {"rootfs": f"local-lvm:{size}"}
-        else:
-            # By default create 8GB disk for LXC
-            self.disks = {"rootfs": "local-lvm:8"}
+        if self.disks is None:
+            if disk_size is not None:
+                # Legacy support: create rootfs by default
+                # Remove a trailing "G" from size if present, keep only the number
+                size = disk_size.rstrip("Gg")
+                self.disks = {"rootfs": f"local-lvm:{size}"}
+            else:
+                # By default create 8GB disk for LXC
+                self.disks = _LXC_DEFAULT_DISKS
 
         # Network configuration
-        if networks is not None:
-            self.networks = networks
-        elif network is not None:
-            # Legacy support: create net0
-            self.networks = {"net0": network}
-        else:
-            # By default create network interface on vmbr0 with DHCP
-            self.networks = {"net0": "name=eth0,bridge=vmbr0,ip=dhcp"}
+        if self.networks is None:
+            if network is not None:
+                # Legacy support: create net0
+                self.networks = {"net0": network}
+            else:
+                # By default create network interface on vmbr0 with DHCP
+                self.networks = _LXC_DEFAULT_NETWORKS
 
         # LXC specific parameters
-        self.ostemplate = ostemplate
-        self.password = password
-        self.ssh_public_keys = ssh_public_keys
-        self.unprivileged = unprivileged if unprivileged is not None else True
-        self.features = features or {}
-        self.startup = startup
-        self.onboot = onboot
-        self.start_on_create = start_on_create if start_on_create is not None else True
+        if self.unprivileged is None:
+            self.unprivileged = True
+        self.features = self.features or {}
+        if self.start_on_create is None:
+            self.start_on_create = True
 
 
 class LXCContainerProvider(dynamic.ResourceProvider):
     """Dynamic provider for Proxmox LXC Containers."""
 
-    def create(self, props: Dict[str, Any]) -> dynamic.CreateResult:
-        """Create an LXC container."""
-        try:
-            # Get Proxmox configuration from props
+    def __init__(self) -> None:
+        super().__init__()
+        self._api_cache: Dict[Tuple[Any, ...], ProxmoxAPI] = {}
+
+    def _get_api(self, props: Dict[str, Any]) -> ProxmoxAPI:
+        """Get the API client for the Proxmox configuration in props, reusing it across operations."""
+        key = (
+            props.get("proxmox_endpoint"),
+            props.get("proxmox_username"),
+            props.get("proxmox_node"),
+            props.get("proxmox_insecure", False),
+        )
+        api = self._api_cache.get(key)
+        if api is None:
             api = ProxmoxAPI(
                 endpoint=props.get("proxmox_endpoint"),
                 username=props.get("proxmox_username"),
@@ -92,56 +130,72 @@ class LXCContainerProvider(dynamic.ResourceProvider):
                 node=props.get("proxmox_node"),
                 insecure=props.get("proxmox_insecure", False),
             )
+            self._api_cache[key] = api
+        return api
+
+    def create(self, props: Dict[str, Any]) -> dynamic.CreateResult:
+        """Create an LXC container."""
+        try:
+            # Get Proxmox configuration from props
+            api = self._get_api(props)
             vm_id = props.get("vm_id") or 200
+            hostname = props.get("hostname") or f"lxc-{vm_id}"
+            endpoint = props.get("proxmox_endpoint")
+            cores = props.get("cores", 1)
+            memory = props.get("memory", 512)
+            swap = props.get("swap", 512)
+            disks = props.get("disks", {})
+            networks = props.get("networks", {})
+            unprivileged = props.get("unprivileged", True)
 
             # Create LXC using Proxmox API
             api.create_lxc(
                 vm_id=vm_id,
-                hostname=props.get("hostname", f"lxc-{vm_id}"),
-                cores=props.get("cores", 1),
-                memory=props.get("memory", 512),
-                swap=props.get("swap", 512),
-                disks=props.get("disks", {}),
-                networks=props.get("networks", {}),
+                hostname=hostname,
+                cores=cores,
+                memory=memory,
+                swap=swap,
+                disks=disks,
+                networks=networks,
                 ostemplate=props.get("ostemplate"),
                 password=props.get("password"),
                 ssh_public_keys=props.get("ssh_public_keys"),
-                unprivileged=props.get("unprivileged", True),
+                unprivileged=unprivileged,
                 features=props.get("features", {}),
                 startup=props.get("startup"),
                 onboot=props.get("onboot"),
             )
 
+            status: Optional[str] = None
+
             # Start the container after creation if start_on_create is specified
             if props.get("start_on_create", True):
                 try:
-                    api.start_lxc(vm_id)
+                    status = api.start_lxc_and_wait(vm_id, timeout=30)
                     pulumi.log.info(f"LXC {vm_id} started automatically after creation")
-
-                    # Wait a moment for the container to start
-                    import time
-
-                    time.sleep(3)
+                    if status != "running":
+                        pulumi.log.warn(f"LXC {vm_id} is {status} after start")
 
                 except Exception as e:
                     pulumi.log.error(f"Failed to start LXC {vm_id} after creation: {e}")
 
-            # Get LXC info after creation (and potential start)
-            lxc_info = api.get_lxc(vm_id)
+            if status is None:
+                # Not started (or the start failed), get LXC info after creation
+                status = api.get_lxc(vm_id).get("status", "unknown")
 
             outputs = {
                 "vm_id": vm_id,
                 "node": props["node"],
-                "hostname": props.get("hostname", f"lxc-{vm_id}"),
-                "status": lxc_info.get("status", "unknown"),
-                "cores": props.get("cores", 1),
-                "memory": props.get("memory", 512),
-                "swap": props.get("swap", 512),
-                "disks": props.get("disks", {}),
-                "networks": props.get("networks", {}),
-                "unprivileged": props.get("unprivileged", True),
+                "hostname": hostname,
+                "status": status,
+                "cores": cores,
+                "memory": memory,
+                "swap": swap,
+                "disks": disks,
+                "networks": networks,
+                "unprivileged": unprivileged,
                 # Save Proxmox configuration for update/delete
-                "proxmox_endpoint": props.get("proxmox_endpoint"),
+                "proxmox_endpoint": endpoint,
                 # "proxmox_username": props.get("proxmox_username"),
                 # "proxmox_password": props.get("proxmox_password"),
                 "proxmox_node": props.get("proxmox_node"),
@@ -159,45 +213,26 @@ class LXCContainerProvider(dynamic.ResourceProvider):
         """Update an LXC container."""
         try:
             # Get Proxmox configuration from props
-            api = ProxmoxAPI(
-                endpoint=new_props.get("proxmox_endpoint"),
-                username=new_props.get("proxmox_username"),
-                password=new_props.get("proxmox_password"),
-                node=new_props.get("proxmox_node"),
-                insecure=new_props.get("proxmox_insecure", False),
-            )
-            vm_id = int(float(id_))  # Сначала float, потом int
+            api = self._get_api(new_props)
+            vm_id = _parse_vm_id(id_)
 
             # Update LXC configuration
-            update_params = {}
-            if new_props.get("cores") != old_props.get("cores"):
-                update_params["cores"] = new_props["cores"]
-            if new_props.get("memory") != old_props.get("memory"):
-                update_params["memory"] = new_props["memory"]
-            if new_props.get("swap") != old_props.get("swap"):
-                update_params["swap"] = new_props["swap"]
-            if new_props.get("hostname") != old_props.get("hostname"):
-                update_params["hostname"] = new_props["hostname"]
-            if new_props.get("disks") != old_props.get("disks"):
-                update_params["disks"] = new_props["disks"]
-            if new_props.get("networks") != old_props.get("networks"):
-                update_params["networks"] = new_props["networks"]
-            if new_props.get("features") != old_props.get("features"):
-                update_params["features"] = new_props["features"]
-            if new_props.get("startup") != old_props.get("startup"):
-                update_params["startup"] = new_props["startup"]
-            if new_props.get("onboot") != old_props.get("onboot"):
-                update_params["onboot"] = new_props["onboot"]
+            update_params = {
+                k: new_props[k]
+                for k in _LXC_UPDATABLE
+                if k in new_props and _canon(new_props.get(k)) != _canon(old_props.get(k))
+            }
 
             if update_params:
+                # Run status does not depend on the config change, fetch it while the update runs
+                status_future = _STATUS_EXECUTOR.submit(api.get_lxc, vm_id)
                 api.update_lxc(vm_id, **update_params)
+                status = status_future.result().get("status", "unknown")
+            else:
+                # Nothing to change, keep the last known status instead of asking Proxmox again
+                status = old_props.get("status", "unknown")
 
-            # Get updated LXC info
-            lxc_info = api.get_lxc(vm_id)
-
-            outputs = old_props.copy()
-            outputs.update(new_props)
-            outputs["status"] = lxc_info.get("status", "unknown")
+            outputs = {**old_props, **new_props, "status": status}
 
             pulumi.log.info(f"Successfully updated LXC {vm_id}")
             return dynamic.UpdateResult(outs=outputs)
@@ -210,14 +245,8 @@ class LXCContainerProvider(dynamic.ResourceProvider):
         """Delete an LXC container."""
         try:
             # Get Proxmox configuration from props
-            api = ProxmoxAPI(
-                endpoint=props.get("proxmox_endpoint"),
-                username=props.get("proxmox_username"),
-                password=props.get("proxmox_password"),
-                node=props.get("proxmox_node"),
-                insecure=props.get("proxmox_insecure", False),
-            )
-            vm_id = int(float(id_))  # Сначала float, потом int
+            api = self._get_api(props)
+            vm_id = _parse_vm_id(id_)
 
             # Delete LXC using Proxmox API
             api.delete_lxc(vm_id)
@@ -257,64 +286,53 @@ class LXCContainer(dynamic.Resource):
 
         # Get Proxmox configuration
         config = pulumi.Config("proxmox")
-
-        props = {
-            # LXC configuration
-            "node": args.node,
-            "vm_id": args.vm_id,
-            "hostname": args.hostname,
-            "template": args.template,
-            "cores": args.cores,
-            "memory": args.memory,
-            "swap": args.swap,
-            "disks": args.disks,
-            "networks": args.networks,
-            "ostemplate": args.ostemplate,
-            "password": args.password,
-            "ssh_public_keys": args.ssh_public_keys,
-            "unprivileged": args.unprivileged,
-            "features": args.features,
-            "startup": args.startup,
-            "onboot": args.onboot,
-            "start_on_create": args.start_on_create,
-            # Proxmox API configuration
-            "proxmox_endpoint": config.require("endpoint"),
-            "proxmox_username": config.require("username"),
-            "proxmox_password": config.require_secret("password"),
-            "proxmox_node": config.get("node", "pve"),
-            "proxmox_insecure": config.get_bool("insecure", False),
-        }
-
-        # Remove None values
-        props = {k: v for k, v in props.items() if v is not None}
+        endpoint = config.require("endpoint")
+        username = config.require("username")
+        node = config.get("node", "pve")
+        insecure = config.get_bool("insecure", False)
+
+        # Only non-None values are passed to the provider
+        props: Dict[str, Any] = {}
+
+        # LXC configuration
+        _put(props, "node", args.node)
+        _put(props, "vm_id", args.vm_id)
+        _put(props, "hostname", args.hostname)
+        _put(props, "template", args.template)
+        _put(props, "cores", args.cores)
+        _put(props, "memory", args.memory)
+        _put(props, "swap", args.swap)
+        _put(props, "disks", args.disks)
+        _put(props, "networks", args.networks)
+        _put(props, "ostemplate", args.ostemplate)
+        _put(props, "password", args.password)
+        _put(props, "ssh_public_keys", args.ssh_public_keys)
+        _put(props, "unprivileged", args.unprivileged)
+        _put(props, "features", args.features)
+        _put(props, "startup", args.startup)
+        _put(props, "onboot", args.onboot)
+        _put(props, "start_on_create", args.start_on_create)
+
+        # Proxmox API configuration
+        _put(props, "proxmox_endpoint", endpoint)
+        _put(props, "proxmox_username", username)
+        password = config.require_secret("password")
+        _put(props, "proxmox_password", password)
+        _put(props, "proxmox_node", node)
+        _put(props, "proxmox_insecure", insecure)
 
         super().__init__(LXCContainerProvider(), resource_name, props, opts)
 
+        # Resolved once here so status lookups do not re-read the config. The
+        # password stays a secret Output and is only unwrapped inside get_status.
+        self._proxmox_cfg: _ProxmoxConfig = (endpoint, username, node, insecure)
+        self._proxmox_password: pulumi.Output[str] = password
+
     def get_status(self) -> pulumi.Output[str]:
         """Get the current status of the LXC container."""
-
-        def _get_status(vm_id_str: str) -> str:
-            """Internal function to get LXC status."""
-            try:
-                # Get Proxmox configuration
-                config = pulumi.Config("proxmox")
-
-                # Create API client
-                api = ProxmoxAPI(
-                    endpoint=config.require("endpoint"),
-                    username=config.require("username"),
-                    password=config.require("password"),
-                    node=config.get("node", "pve"),
-                    insecure=config.get_bool("insecure", False),
-                )
-
-                # Get LXC status
-                vm_id = int(vm_id_str)
-                lxc_info = api.get_lxc(vm_id)
-                status = lxc_info.get("status")
-                return status if status is not None else "unknown"
-            except Exception as e:
-                pulumi.log.warn(f"Failed to get LXC status: {e}")
-                return "unknown"
-
-        return self.vm_id.apply(lambda vm_id: _get_status(str(vm_id)))
+        proxmox_cfg = self._proxmox_cfg
+        status = pulumi.Output.all(self.vm_id, self._proxmox_password).apply(
+            lambda args: _get_lxc_status(proxmox_cfg, args[1], str(args[0]))
+        )
+        # The status itself is not sensitive, only the password used to read it
+        return pulumi.Output.unsecret(status)
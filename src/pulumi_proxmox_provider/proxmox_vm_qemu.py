@@ -2,78 +2,92 @@
 Virtual Machine resource for Proxmox.
 """
 
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import InitVar, dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 import pulumi
 import pulumi.dynamic as dynamic
+from ._util import _canon, _parse_vm_id, _put
 from .proxmox_api import ProxmoxAPI
 
+# Properties that can be changed on an existing virtual machine
+_VM_UPDATABLE = frozenset({"cores", "memory", "name", "disks", "networks"})
 
+# Read-only defaults shared by all args instances
+_VM_DEFAULT_DISKS: Mapping[str, str] = MappingProxyType({"scsi0": "local-lvm:20"})
+_VM_DEFAULT_NETWORKS: Mapping[str, str] = MappingProxyType({"net0": "virtio,bridge=vmbr0"})
+
+# Reads the run status while update() applies a config change. Shared by all
+# updates so no thread pool is started per call.
+_STATUS_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="proxmox-vm-status")
+
+
+@dataclass(slots=True)
 class VirtualMachineArgs:
     """Arguments for creating a Virtual Machine."""
 
-    def __init__(
-        self,
-        node: str,
-        vm_id: Optional[int] = None,
-        name: Optional[str] = None,
-        template: Optional[str] = None,
-        cores: Optional[int] = None,
-        memory: Optional[int] = None,
-        # Disk configuration
-        disks: Optional[Dict[str, str]] = None,
-        # Network configuration
-        networks: Optional[Dict[str, str]] = None,
-        # Legacy parameters for compatibility
-        disk_size: Optional[str] = None,
-        network: Optional[str] = None,
-        # Additional parameters
-        ssh_keys: Optional[str] = None,
-        ip_config: Optional[str] = None,
-        user: Optional[str] = None,
-        password: Optional[str] = None,
-    ):
-        self.node = node
-        self.vm_id = vm_id
-        self.name = name
-        self.template = template
-        self.cores = cores or 1
-        self.memory = memory or 512
+    node: str
+    vm_id: Optional[int] = None
+    name: Optional[str] = None
+    template: Optional[str] = None
+    cores: Optional[int] = None
+    memory: Optional[int] = None
+    # Disk configuration
+    disks: Optional[Mapping[str, str]] = None
+    # Network configuration
+    networks: Optional[Mapping[str, str]] = None
+    # Legacy parameters for compatibility
+    disk_size: InitVar[Optional[str]] = None
+    network: InitVar[Optional[str]] = None
+    # Additional parameters
+    ssh_keys: Optional[str] = None
+    ip_config: Optional[str] = None
+    user: Optional[str] = None
+    password: Optional[str] = field(default=None, repr=False)
+
+    def __post_init__(self, disk_size: Optional[str], network: Optional[str]) -> None:
+        self.cores = self.cores or 1
+        self.memory = self.memory or 512
 
         # Disk configuration
-        if disks is not None:
-            self.disks = disks
-        elif disk_size is not None:
-            # Legacy support: create scsi0 by default
-            # Remove "G" from size if present, keep only the number
-            size = disk_size.replace("G", "").replace("g", "")
-            self.disks = {"scsi0": f"local-lvm:{size}"}
-        else:
-            # By default create 20GB disk
-            self.disks = {"scsi0": "local-lvm:20"}
+        if self.disks is None:
+            if disk_size is not None:
+                # Legacy support: create scsi0 by default
+                # Remove a trailing "G" from size if present, keep only the number
+                size = disk_size.rstrip("Gg")
+                self.disks = {"scsi0": f"local-lvm:{size}"}
+            else:
+                # By default create 20GB disk
+                self.disks = _VM_DEFAULT_DISKS
 
         # Network configuration
-        if networks is not None:
-            self.networks = networks
-        elif network is not None:
-            # Legacy support: create net0
-            self.networks = {"net0": network}
-        else:
-            # By default create network interface on vmbr0
-            self.networks = {"net0": "virtio,bridge=vmbr0"}
-
-        self.ssh_keys = ssh_keys
-        self.ip_config = ip_config
-        self.user = user
-        self.password = password
+        if self.networks is None:
+            if network is not None:
+                # Legacy support: create net0
+                self.networks = {"net0": network}
+            else:
+                # By default create network interface on vmbr0
+                self.networks = _VM_DEFAULT_NETWORKS
 
 
 class VirtualMachineProvider(dynamic.ResourceProvider):
     """Dynamic provider for Proxmox Virtual Machines."""
 
-    def create(self, props: Dict[str, Any]) -> dynamic.CreateResult:
-        """Create a virtual machine."""
-        try:
-            # Get Proxmox configuration from props
+    def __init__(self) -> None:
+        super().__init__()
+        self._api_cache: Dict[Tuple[Any, ...], ProxmoxAPI] = {}
+
+    def _get_api(self, props: Dict[str, Any]) -> ProxmoxAPI:
+        """Get the API client for the Proxmox configuration in props, reusing it across operations."""
+        key = (
+            props.get("proxmox_endpoint"),
+            props.get("proxmox_username"),
+            props.get("proxmox_node"),
+            props.get("proxmox_insecure", False),
+        )
+        api = self._api_cache.get(key)
+        if api is None:
             api = ProxmoxAPI(
                 endpoint=props.get("proxmox_endpoint"),
                 username=props.get("proxmox_username"),
@@ -81,16 +95,30 @@ class VirtualMachineProvider(dynamic.ResourceProvider):
                 node=props.get("proxmox_node"),
                 insecure=props.get("proxmox_insecure", False),
             )
+            self._api_cache[key] = api
+        return api
+
+    def create(self, props: Dict[str, Any]) -> dynamic.CreateResult:
+        """Create a virtual machine."""
+        try:
+            # Get Proxmox configuration from props
+            api = self._get_api(props)
             vm_id = props.get("vm_id") or 100
+            name = props.get("name") or f"vm-{vm_id}"
+            endpoint = props.get("proxmox_endpoint")
+            cores = props.get("cores", 1)
+            memory = props.get("memory", 512)
+            disks = props.get("disks", {})
+            networks = props.get("networks", {})
 
             # Create VM using Proxmox API
             api.create_vm(
                 vm_id=vm_id,
-                cores=props.get("cores", 1),
-                memory=props.get("memory", 512),
-                name=props.get("name", f"vm-{vm_id}"),
-                disks=props.get("disks", {}),
-                networks=props.get("networks", {}),
+                cores=cores,
+                memory=memory,
+                name=name,
+                disks=disks,
+                networks=networks,
             )
 
             # Don't start VM automatically until we resolve type issues
@@ -102,14 +130,14 @@ class VirtualMachineProvider(dynamic.ResourceProvider):
             outputs = {
                 "vm_id": vm_id,
                 "node": props["node"],
-                "name": props.get("name", f"vm-{vm_id}"),
+                "name": name,
                 "status": vm_info.get("status", "unknown"),
-                "cores": props.get("cores", 1),
-                "memory": props.get("memory", 512),
-                "disks": props.get("disks", {}),
-                "networks": props.get("networks", {}),
+                "cores": cores,
+                "memory": memory,
+                "disks": disks,
+                "networks": networks,
                 # Save Proxmox configuration for update/delete
-                "proxmox_endpoint": props.get("proxmox_endpoint"),
+                "proxmox_endpoint": endpoint,
                 # "proxmox_username": props.get("proxmox_username"),
                 # "proxmox_password": props.get("proxmox_password"),
                 "proxmox_node": props.get("proxmox_node"),
@@ -127,37 +155,26 @@ class VirtualMachineProvider(dynamic.ResourceProvider):
         """Update a virtual machine."""
         try:
             # Get Proxmox configuration from props
-            api = ProxmoxAPI(
-                endpoint=new_props.get("proxmox_endpoint"),
-                username=new_props.get("proxmox_username"),
-                password=new_props.get("proxmox_password"),
-                node=new_props.get("proxmox_node"),
-                insecure=new_props.get("proxmox_insecure", False),
-            )
-            vm_id = int(float(id_))  # Сначала float, потом int
+            api = self._get_api(new_props)
+            vm_id = _parse_vm_id(id_)
 
             # Update VM configuration
-            update_params = {}
-            if new_props.get("cores") != old_props.get("cores"):
-                update_params["cores"] = new_props["cores"]
-            if new_props.get("memory") != old_props.get("memory"):
-                update_params["memory"] = new_props["memory"]
-            if new_props.get("name") != old_props.get("name"):
-                update_params["name"] = new_props["name"]
-            if new_props.get("disks") != old_props.get("disks"):
-                update_params["disks"] = new_props["disks"]
-            if new_props.get("networks") != old_props.get("networks"):
-                update_params["networks"] = new_props["networks"]
+            update_params = {
+                k: new_props[k]
+                for k in _VM_UPDATABLE
+                if k in new_props and _canon(new_props.get(k)) != _canon(old_props.get(k))
+            }
 
             if update_params:
+                # Run status does not depend on the config change, fetch it while the update runs
+                status_future = _STATUS_EXECUTOR.submit(api.get_vm, vm_id)
                 api.update_vm(vm_id, **update_params)
+                status = status_future.result().get("status", "unknown")
+            else:
+                # Nothing to change, keep the last known status instead of asking Proxmox again
+                status = old_props.get("status", "unknown")
 
-            # Get updated VM info
-            vm_info = api.get_vm(vm_id)
-
-            outputs = old_props.copy()
-            outputs.update(new_props)
-            outputs["status"] = vm_info.get("status", "unknown")
+            outputs = {**old_props, **new_props, "status": status}
 
             pulumi.log.info(f"Successfully updated VM {vm_id}")
             return dynamic.UpdateResult(outs=outputs)
@@ -170,14 +187,8 @@ class VirtualMachineProvider(dynamic.ResourceProvider):
         """Delete a virtual machine."""
         try:
             # Get Proxmox configuration from props
-            api = ProxmoxAPI(
-                endpoint=props.get("proxmox_endpoint"),
-                username=props.get("proxmox_username"),
-                password=props.get("proxmox_password"),
-                node=props.get("proxmox_node"),
-                insecure=props.get("proxmox_insecure", False),
-            )
-            vm_id = int(float(id_))
+            api = self._get_api(props)
+            vm_id = _parse_vm_id(id_)
 
             # Delete VM using Proxmox API
             api.delete_vm(vm_id)
@@ -215,29 +226,28 @@ class VirtualMachine(dynamic.Resource):
         # Get Proxmox configuration
         config = pulumi.Config("proxmox")
 
-        props = {
-            # VM configuration
-            "node": args.node,
-            "vm_id": args.vm_id,
-            "name": args.name,
-            "template": args.template,
-            "cores": args.cores,
-            "memory": args.memory,
-            "disks": args.disks,
-            "networks": args.networks,
-            "ssh_keys": args.ssh_keys,
-            "ip_config": args.ip_config,
-            "user": args.user,
-            "password": args.password,
-            # Proxmox API configuration
-            "proxmox_endpoint": config.require("endpoint"),
-            "proxmox_username": config.require("username"),
-            "proxmox_password": config.require_secret("password"),
-            "proxmox_node": config.get("node", "pve"),
-            "proxmox_insecure": config.get_bool("insecure", False),
-        }
-
-        # Remove None values
-        props = {k: v for k, v in props.items() if v is not None}
+        # Only non-None values are passed to the provider
+        props: Dict[str, Any] = {}
+
+        # VM configuration
+        _put(props, "node", args.node)
+        _put(props, "vm_id", args.vm_id)
+        _put(props, "name", args.name)
+        _put(props, "template", args.template)
+        _put(props, "cores", args.cores)
+        _put(props, "memory", args.memory)
+        _put(props, "disks", args.disks)
+        _put(props, "networks", args.networks)
+        _put(props, "ssh_keys", args.ssh_keys)
+        _put(props, "ip_config", args.ip_config)
+        _put(props, "user", args.user)
+        _put(props, "password", args.password)
+
+        # Proxmox API configuration
+        _put(props, "proxmox_endpoint", config.require("endpoint"))
+        _put(props, "proxmox_username", config.require("username"))
+        _put(props, "proxmox_password", config.require_secret("password"))
+        _put(props, "proxmox_node", config.get("node", "pve"))
+        _put(props, "proxmox_insecure", config.get_bool("insecure", False))
 
         super().__init__(VirtualMachineProvider(), resource_name, props, opts)
@@ -2,6 +2,10 @@
 Tests for Pulumi Proxmox Provider
 """
 
+import asyncio
+import importlib.util
+import time
+import pulumi
 import pytest
 import unittest
 from unittest.mock import Mock, patch
@@ -30,5 +34,470 @@ class TestProxmoxProvider(unittest.TestCase):
         self.assertTrue(ProxmoxProvider)
 
 
+class TestProxmoxAPI(unittest.TestCase):
+    """Test cases for the Proxmox API client."""
+
+    def test_session_shared_per_endpoint(self):
+        """Test that clients for the same endpoint share one session."""
+        from pulumi_proxmox_provider.proxmox_api import ProxmoxAPI
+
+        first = ProxmoxAPI(endpoint="https://pve-a:8006/api2/json", username="root@pam", password="x")
+        second = ProxmoxAPI(endpoint="https://pve-a:8006/api2/json", username="other@pve", password="y")
+        other = ProxmoxAPI(endpoint="https://pve-b:8006/api2/json", username="root@pam", password="x")
+
+        self.assertIs(first.session, second.session)
+        self.assertIsNot(first.session, other.session)
+        self.assertEqual(len(first.session.cookies), 0)
+
+    def test_ticket_reused_across_clients(self):
+        """Test that a live ticket is reused instead of logging in again."""
+        from pulumi_proxmox_provider import proxmox_api
+
+        proxmox_api._TICKET_CACHE.clear()
+        login = Mock()
+        login.json.return_value = {"data": {"ticket": "T", "CSRFPreventionToken": "C"}}
+
+        first = proxmox_api.ProxmoxAPI(endpoint="https://pve-t:8006/api2/json", username="root@pam", password="x")
+        second = proxmox_api.ProxmoxAPI(endpoint="https://pve-t:8006/api2/json", username="root@pam", password="x")
+        with patch.object(first.session, "post", return_value=login) as post:
+            self.assertTrue(first._authenticate())
+            self.assertTrue(second._authenticate())
+
+        post.assert_called_once()
+        self.assertEqual(second._auth_cookies, {"PVEAuthCookie": "T"})
+        self.assertEqual(second._auth_headers, {"CSRFPreventionToken": "C"})
+
+    def test_resize_skipped_when_size_unchanged(self):
+        """Test that disks already at the requested size are not resized."""
+        from pulumi_proxmox_provider.proxmox_api import ProxmoxAPI
+
+        api = ProxmoxAPI(endpoint="https://pve-a:8006/api2/json", username="root@pam", password="x")
+        config = {"data": {"rootfs": "local-lvm:vm-215-disk-0,size=8G", "mp0": "local-lvm:vm-215-disk-1,size=4G"}}
+        with patch.object(api, "_make_request", return_value=config) as make_request:
+            api.update_lxc(215, disks={"rootfs": "local-lvm:8", "mp0": "local-lvm:6"})
+
+        resize_calls = [c for c in make_request.call_args_list if c.args[1].endswith("/resize")]
+        self.assertEqual(len(resize_calls), 1)
+        self.assertEqual(resize_calls[0].args[2], {"disk": "mp0", "size": "6G"})
+
+    def test_update_sends_only_changed_fields(self):
+        """Test that fields matching the current config are not sent."""
+        from pulumi_proxmox_provider.proxmox_api import ProxmoxAPI
+
+        api = ProxmoxAPI(endpoint="https://pve-a:8006/api2/json", username="root@pam", password="x")
+        config = {"data": {"cores": 2, "memory": 1024, "onboot": 1}}
+        with patch.object(api, "_make_request", return_value=config) as make_request:
+            api.update_lxc(215, cores=2, memory=2048)
+            make_request.assert_called_with("PUT", "nodes/pve/lxc/215/config", {"memory": 2048})
+
+            make_request.reset_mock()
+            self.assertEqual(api.update_lxc(215, cores=2, onboot=True), {"data": None})
+            make_request.assert_called_once_with("GET", "nodes/pve/lxc/215/config")
+
+            # Non-scalar fields are sent as is, without reading the config first
+            make_request.reset_mock()
+            api.update_lxc(215, features={"nesting": 1}, networks={"net0": "name=eth0,bridge=vmbr0,ip=dhcp"})
+            make_request.assert_called_once_with(
+                "PUT",
+                "nodes/pve/lxc/215/config",
+                {"net0": "name=eth0,bridge=vmbr0,ip=dhcp", "features": "nesting=1"},
+            )
+
+    def test_rejected_ticket_refreshed_once_across_threads(self):
+        """Test that threads sharing a client re-authenticate only once on 401."""
+        import threading
+        from pulumi_proxmox_provider.proxmox_api import ProxmoxAPI
+
+        api = ProxmoxAPI(endpoint="https://pve-r:8006/api2/json", username="root@pam", password="x")
+        api._set_ticket("old", "C")
+        both_sent = threading.Barrier(2, timeout=5)
+
+        def send(method, url, data=None):
+            if api.ticket == "old":
+                both_sent.wait()
+                return Mock(status_code=401)
+            return Mock(status_code=200, content=b'{"data": "ok"}', json=Mock(return_value={"data": "ok"}))
+
+        def login():
+            api._set_ticket("new", "C")
+            return True
+
+        with (
+            patch.object(api, "_send", side_effect=send),
+            patch.object(api, "_authenticate", side_effect=login) as auth,
+        ):
+            threads = [threading.Thread(target=api._make_request, args=("GET", "version")) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        auth.assert_called_once()
+        self.assertEqual(api.ticket, "new")
+
+    def test_delete_lxc_batch_runs_concurrently_and_reports_failures(self):
+        """Test that batch deletes overlap and failed containers are reported together."""
+        import threading
+        from pulumi_proxmox_provider.proxmox_api import ProxmoxAPI
+
+        api = ProxmoxAPI(endpoint="https://pve-b:8006/api2/json", username="root@pam", password="x")
+        api._set_ticket("T", "C")
+        # Only passes if all three deletes are in flight at the same time
+        all_started = threading.Barrier(3, timeout=5)
+
+        def delete(vm_id):
+            all_started.wait()
+            if vm_id == 302:
+                raise Exception("storage busy")
+            return {"data": f"UPID:{vm_id}"}
+
+        with patch.object(api, "delete_lxc", side_effect=delete) as delete_lxc:
+            with self.assertRaises(Exception) as ctx:
+                api.delete_lxc_batch([301, 302, 303])
+
+        self.assertEqual(sorted(c.args[0] for c in delete_lxc.call_args_list), [301, 302, 303])
+        self.assertIn("[302]", str(ctx.exception))
+        self.assertIn("storage busy", str(ctx.exception))
+
+        with patch.object(api, "delete_lxc", side_effect=lambda vm_id: {"data": vm_id}):
+            self.assertEqual(api.delete_lxc_batch([301, 303]), {301: {"data": 301}, 303: {"data": 303}})
+
+    def test_delete_running_lxc_stops_without_logging_errors(self):
+        """Test that deleting a running container stops it first without error logs."""
+        import json
+        import requests
+        from pulumi_proxmox_provider.proxmox_api import ProxmoxAPI
+
+        def response(status, data=None, reason="OK"):
+            resp = requests.Response()
+            resp.status_code = status
+            resp.reason = reason
+            resp.url = "https://pve-d:8006/api2/json"
+            resp._content = json.dumps({"data": data}).encode()
+            return resp
+
+        api = ProxmoxAPI(endpoint="https://pve-d:8006/api2/json", username="root@pam", password="x")
+        api._set_ticket("T", "C")
+        calls = []
+
+        def send(method, url, data=None):
+            path = url.split("/api2/json/", 1)[1]
+            calls.append((method, path))
+            stopped = ("POST", "nodes/pve/lxc/215/status/stop") in calls
+            if method == "DELETE":
+                return response(200, "UPID:delete") if stopped else response(500, reason="CT 215 is running")
+            if path.endswith("/status/stop"):
+                return response(200, "UPID:stop")
+            if path.startswith("nodes/pve/tasks/"):
+                return response(200, {"status": "stopped", "exitstatus": "OK"})
+            return response(200, {"status": "stopped" if stopped else "running"})
+
+        with (
+            patch.object(api, "_send", side_effect=send),
+            patch("pulumi_proxmox_provider.proxmox_api.time.sleep"),
+            patch("pulumi_proxmox_provider.proxmox_api.pulumi.log.error") as log_error,
+        ):
+            self.assertEqual(api.delete_lxc(215), {"data": "UPID:delete"})
+
+        log_error.assert_not_called()
+        self.assertEqual(calls[0], ("DELETE", "nodes/pve/lxc/215"))
+        self.assertIn(("POST", "nodes/pve/lxc/215/status/stop"), calls)
+        self.assertEqual(calls[-1], ("DELETE", "nodes/pve/lxc/215"))
+
+    def test_malformed_response_is_reported_as_request_error(self):
+        """Test that a non-JSON body is handled like any other failed request."""
+        import requests
+        from pulumi_proxmox_provider.proxmox_api import _REQUEST_ERRORS, ProxmoxAPI
+
+        api = ProxmoxAPI(endpoint="https://pve-j:8006/api2/json", username="root@pam", password="x")
+        api._set_ticket("T", "C")
+        body = Mock(status_code=200, content=b"<html>proxy error</html>", response=None)
+        body.json.side_effect = requests.exceptions.JSONDecodeError("Expecting value", "<html>", 0)
+
+        with (
+            patch.object(api, "_send", return_value=body),
+            patch("pulumi_proxmox_provider.proxmox_api.pulumi.log.error") as log_error,
+        ):
+            with self.assertRaises(_REQUEST_ERRORS):
+                api._make_request("GET", "version")
+
+        log_error.assert_called()
+
+    @unittest.skipIf(importlib.util.find_spec("curl_cffi") is None, "curl_cffi is not installed")
+    def test_curl_session_retries_gateway_errors(self):
+        """Test that the curl backend retries gateway errors and dropped connections."""
+        from curl_cffi.requests.exceptions import ConnectionError as CurlConnectionError
+        from pulumi_proxmox_provider.proxmox_api import _CurlRetrySession
+
+        inner = Mock()
+        inner.request.side_effect = [CurlConnectionError("reset"), Mock(status_code=503), Mock(status_code=200)]
+        with patch("pulumi_proxmox_provider.proxmox_api.time.sleep") as sleep:
+            response = _CurlRetrySession(inner).request("DELETE", "https://pve/api2/json/nodes/pve/lxc/215")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(inner.request.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+        inner.request.side_effect = None
+        inner.request.return_value = Mock(status_code=500)
+        inner.request.reset_mock()
+        with patch("pulumi_proxmox_provider.proxmox_api.time.sleep"):
+            self.assertEqual(_CurlRetrySession(inner).post("https://pve/x").status_code, 500)
+        inner.request.assert_called_once()
+
+    def test_parse_vm_id(self):
+        """Test that integer and float-formatted resource IDs are parsed."""
+        from pulumi_proxmox_provider._util import _parse_vm_id
+
+        self.assertEqual(_parse_vm_id("215"), 215)
+        self.assertEqual(_parse_vm_id("215.0"), 215)
+
+    def test_canon_treats_empty_containers_as_unset(self):
+        """Test the property normalization used to diff updates."""
+        from pulumi_proxmox_provider._util import _canon
+
+        self.assertIsNone(_canon({}))
+        self.assertIsNone(_canon([]))
+        self.assertIsNone(_canon(None))
+        self.assertEqual(_canon(0), 0)
+        self.assertIs(_canon(False), False)
+        self.assertEqual(_canon({"b": 1, "a": {2: "x", "k": object}}), {"a": {2: "x", "k": object}, "b": 1})
+        self.assertNotEqual(_canon({"nesting": 1}), _canon({"nesting": 0}))
+
+
+@unittest.skipIf(importlib.util.find_spec("httpx") is None, "httpx is not installed")
+class TestAsyncProxmoxAPI(unittest.TestCase):
+    """Test cases for the async Proxmox API client."""
+
+    ENDPOINT = "https://pve-async:8006/api2/json"
+
+    def setUp(self):
+        from pulumi_proxmox_provider import proxmox_api
+
+        proxmox_api._TICKET_CACHE.clear()
+        self.logins = 0
+        self.rejected = 0
+
+    def _handler(self, valid_ticket):
+        import httpx
+
+        async def handle(request):
+            if request.url.path.endswith("/access/ticket"):
+                self.logins += 1
+                # Yield like a real login round trip would, so concurrent callers overlap
+                await asyncio.sleep(0.01)
+                return httpx.Response(200, json={"data": {"ticket": valid_ticket, "CSRFPreventionToken": "C"}})
+            if f"PVEAuthCookie={valid_ticket}" not in request.headers.get("cookie", ""):
+                self.rejected += 1
+                return httpx.Response(401)
+            vm_id = int(request.url.path.split("/")[-3])
+            return httpx.Response(200, json={"data": {"vmid": vm_id, "status": "running"}})
+
+        return handle
+
+    def _run(self, handler, coro_fn):
+        import httpx
+        from pulumi_proxmox_provider.proxmox_api_async import AsyncProxmoxAPI
+
+        async def main():
+            api = AsyncProxmoxAPI(endpoint=self.ENDPOINT, username="root@pam", password="x")
+            await api.aclose()
+            api._client = httpx.AsyncClient(base_url=api.endpoint, transport=httpx.MockTransport(handler))
+            async with api:
+                return await coro_fn(api)
+
+        return asyncio.run(main())
+
+    def test_get_lxc_many_logs_in_once(self):
+        """Test that concurrent requests on a fresh client share a single login."""
+        result = self._run(self._handler("T"), lambda api: api.get_lxc_many([201, 202, 203]))
+
+        self.assertEqual([info["vmid"] for info in result], [201, 202, 203])
+        self.assertEqual(self.logins, 1)
+        self.assertEqual(self.rejected, 0)
+
+    def test_rejected_ticket_refreshed_once(self):
+        """Test that a revoked cached ticket triggers one re-authentication."""
+        from pulumi_proxmox_provider import proxmox_api
+
+        proxmox_api._TICKET_CACHE[(self.ENDPOINT, "root@pam")] = ("stale", "C", time.time())
+        result = self._run(self._handler("fresh"), lambda api: api.get_vm_many([101, 102]))
+
+        self.assertEqual([info["status"] for info in result], ["running", "running"])
+        self.assertEqual(self.logins, 1)
+        self.assertGreaterEqual(self.rejected, 1)
+        self.assertEqual(proxmox_api._TICKET_CACHE[(self.ENDPOINT, "root@pam")][0], "fresh")
+
+
+class _PulumiMocks(pulumi.runtime.Mocks):
+    """Pulumi mocks that echo resource inputs back as outputs."""
+
+    def new_resource(self, args):
+        return [f"{args.name}_id", {**args.inputs, "vm_id": args.inputs.get("vm_id")}]
+
+    def call(self, args):
+        return {}
+
+
+class TestLXCContainer(unittest.TestCase):
+    """Test cases for the LXC container resource."""
+
+    @classmethod
+    def setUpClass(cls):
+        # asyncio.run() in other tests leaves no current event loop behind
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        pulumi.runtime.set_mocks(_PulumiMocks(), preview=False)
+        for key, value in {
+            "endpoint": "https://pve-m:8006/api2/json",
+            "username": "root@pam",
+            "password": "s3cret",
+        }.items():
+            pulumi.runtime.set_config(f"proxmox:{key}", value)
+
+    @patch("pulumi_proxmox_provider.proxmox_lxc.ProxmoxAPI")
+    @pulumi.runtime.test
+    def test_status_lookup_keeps_password_secret(self, api_cls):
+        """Test that the resource holds no plaintext password and get_status still logs in."""
+        from pulumi_proxmox_provider.proxmox_lxc import LXCContainer, LXCContainerArgs
+
+        api_cls.return_value.get_lxc.return_value = {"status": "running"}
+        container = LXCContainer("ct", LXCContainerArgs(node="pve", vm_id=215))
+        self.assertNotIn("s3cret", repr(vars(container)))
+
+        def check(status):
+            self.assertEqual(status, "running")
+            self.assertEqual(api_cls.call_args.kwargs["password"], "s3cret")
+
+        return container.get_status().apply(check)
+
+
+class TestLXCContainerProvider(unittest.TestCase):
+    """Test cases for the LXC dynamic provider."""
+
+    PROPS = {"node": "pve", "vm_id": 215, "proxmox_endpoint": "https://pve:8006/api2/json", "proxmox_node": "pve"}
+
+    def _create(self, api, **props):
+        from pulumi_proxmox_provider.proxmox_lxc import LXCContainerProvider
+
+        provider = LXCContainerProvider()
+        with patch.object(provider, "_get_api", return_value=api):
+            return provider.create({**self.PROPS, **props})
+
+    def test_start_lxc_and_wait(self):
+        """Test that the start task decides the status, with polling only as a fallback."""
+        from pulumi_proxmox_provider.proxmox_api import ProxmoxAPI
+
+        api = ProxmoxAPI(endpoint="https://pve:8006/api2/json", username="root@pam", password="x")
+        with (
+            patch.object(api, "start_lxc", return_value={"data": "UPID:start"}),
+            patch.object(api, "_task_exit_status", return_value="OK") as task_exit_status,
+            patch.object(api, "get_lxc") as get_lxc,
+        ):
+            self.assertEqual(api.start_lxc_and_wait(215, timeout=30), "running")
+        task_exit_status.assert_called_once_with("UPID:start", 30)
+        get_lxc.assert_not_called()
+
+        # A failed start task is reported right away instead of polling until the timeout
+        with (
+            patch.object(api, "start_lxc", return_value={"data": "UPID:start"}),
+            patch.object(api, "_task_exit_status", return_value="startup for container '215' failed"),
+            patch.object(api, "get_lxc", return_value={"status": "stopped"}) as get_lxc,
+            patch.object(api, "_wait_for_lxc_status") as wait_for_status,
+        ):
+            self.assertEqual(api.start_lxc_and_wait(215), "stopped")
+        get_lxc.assert_called_once_with(215)
+        wait_for_status.assert_not_called()
+
+        # Without a task to wait on, the container status is polled
+        with (
+            patch.object(api, "start_lxc", return_value={"data": None}),
+            patch.object(api, "get_lxc", side_effect=[{"status": "stopped"}, {"status": "running"}]) as get_lxc,
+            patch("pulumi_proxmox_provider.proxmox_api.time.sleep"),
+        ):
+            self.assertEqual(api.start_lxc_and_wait(215), "running")
+        self.assertEqual(get_lxc.call_count, 2)
+
+    def test_create_uses_status_from_start(self):
+        """Test that create takes the status from the start wait and falls back to get_lxc."""
+        api = Mock()
+        api.start_lxc_and_wait.return_value = "running"
+        result = self._create(api)
+        self.assertEqual(result.outs["status"], "running")
+        api.get_lxc.assert_not_called()
+
+        api = Mock()
+        api.start_lxc_and_wait.side_effect = Exception("start failed")
+        api.get_lxc.return_value = {"status": "stopped"}
+        self.assertEqual(self._create(api).outs["status"], "stopped")
+        api.get_lxc.assert_called_once_with(215)
+
+        api = Mock()
+        api.get_lxc.return_value = {"status": "stopped"}
+        self.assertEqual(self._create(api, start_on_create=False).outs["status"], "stopped")
+        api.start_lxc_and_wait.assert_not_called()
+
+
+class TestProviderUpdate(unittest.TestCase):
+    """Test cases for update() in both dynamic providers."""
+
+    OLD = {"node": "pve", "vm_id": 215, "cores": 1, "memory": 512, "status": "running"}
+
+    def _update(self, provider, api, new_props):
+        with patch.object(provider, "_get_api", return_value=api):
+            return provider.update("215", dict(self.OLD), {**self.OLD, **new_props})
+
+    def _providers(self):
+        from pulumi_proxmox_provider.proxmox_lxc import LXCContainerProvider
+        from pulumi_proxmox_provider.proxmox_vm_qemu import VirtualMachineProvider
+
+        return [
+            (LXCContainerProvider(), "update_lxc", "get_lxc"),
+            (VirtualMachineProvider(), "update_vm", "get_vm"),
+        ]
+
+    def test_noop_update_makes_no_api_calls(self):
+        """Test that an unchanged resource keeps its last status without calling Proxmox."""
+        for provider, _, _ in self._providers():
+            with self.subTest(provider=type(provider).__name__):
+                api = Mock()
+                # Empty containers count as unset, so this is not a change either
+                result = self._update(provider, api, {"disks": {}, "networks": {}, "status": "ignored"})
+
+                self.assertEqual(api.method_calls, [])
+                self.assertEqual(result.outs["status"], "running")
+
+    def test_update_fetches_status_alongside_change(self):
+        """Test that changed properties are sent and the status is read while they apply."""
+        for provider, update_name, get_name in self._providers():
+            with self.subTest(provider=type(provider).__name__):
+                api = Mock()
+                getattr(api, get_name).return_value = {"status": "stopped"}
+                result = self._update(provider, api, {"cores": 2, "memory": 512})
+
+                getattr(api, update_name).assert_called_once_with(215, cores=2)
+                getattr(api, get_name).assert_called_once_with(215)
+                self.assertEqual(result.outs["status"], "stopped")
+                self.assertEqual(result.outs["cores"], 2)
+
+
+class TestResourceArgs(unittest.TestCase):
+    """Test cases for the resource argument classes."""
+
+    def test_lxc_args_legacy_parameters(self):
+        """Test that legacy disk_size/network arguments map to disks/networks."""
+        from pulumi_proxmox_provider.proxmox_lxc import LXCContainerArgs
+
+        args = LXCContainerArgs(node="pve", disk_size="16G", network="name=eth0,bridge=vmbr1")
+        self.assertEqual(args.disks, {"rootfs": "local-lvm:16"})
+        self.assertEqual(args.networks, {"net0": "name=eth0,bridge=vmbr1"})
+        self.assertEqual((args.cores, args.memory, args.swap), (1, 512, 512))
+        self.assertTrue(args.unprivileged)
+        self.assertTrue(args.start_on_create)
+
+        args = LXCContainerArgs(node="pve", disks={"rootfs": "local-lvm:4"}, disk_size="16G", unprivileged=False)
+        self.assertEqual(args.disks, {"rootfs": "local-lvm:4"})
+        self.assertFalse(args.unprivileged)
+
+
 if __name__ == "__main__":
     unittest.main()